@@ -0,0 +1,5 @@
+#!/usr/bin/python3
+
+"""
+Reproducible benchmarks for the storage engine and console.
+"""
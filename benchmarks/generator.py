@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+
+"""
+Seeded generator for synthetic datasets in the FileStorage JSON format.
+
+The generated graph mirrors real listings: States own Cities, Cities own
+Places, Places belong to Users, carry amenity_ids and receive Reviews.
+The same seed and scale always produce the same file.
+
+Usage:
+    python3 -m benchmarks.generator --scale 100k --seed 42 -o data.json
+"""
+
+import argparse
+import json
+import uuid
+from datetime import datetime, timedelta
+from random import Random
+
+SCALES = {"10k": 10000, "100k": 100000, "1m": 1000000}
+EPOCH = datetime(2020, 1, 1)
+WORDS = ("cozy", "sunny", "quiet", "modern", "rustic", "spacious", "charming",
+         "bright", "central", "private", "loft", "cabin", "villa", "studio",
+         "garden", "view", "beach", "lake", "mountain", "downtown")
+
+
+def parse_scale(scale):
+    """
+    Returns the number of objects for a scale name like '100k' or a number.
+    """
+    scale = str(scale).lower()
+    if scale in SCALES:
+        return SCALES[scale]
+    return int(scale)
+
+
+class DatasetGenerator:
+    """
+    Builds a serialized object graph of a given size from a seed.
+    """
+
+    def __init__(self, seed=42):
+        """
+        Initializes the generator with its own random stream.
+        """
+        self.rng = Random(seed)
+        self.data = {}
+
+    def _id(self):
+        """
+        Returns a reproducible uuid4 string.
+        """
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _timestamps(self):
+        """
+        Returns a reproducible (created_at, updated_at) pair of strings.
+        """
+        created = EPOCH + timedelta(seconds=self.rng.randrange(10 ** 8),
+                                    microseconds=self.rng.randrange(10 ** 6))
+        updated = created + timedelta(seconds=self.rng.randrange(10 ** 6))
+        return (created.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+                updated.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+
+    def _words(self, count):
+        """
+        Returns count random words joined by spaces.
+        """
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def _add(self, class_name, **fields):
+        """
+        Adds a serialized object to the dataset and returns its id.
+        """
+        obj_id = self._id()
+        created_at, updated_at = self._timestamps()
+        fields.update(id=obj_id, created_at=created_at,
+                      updated_at=updated_at, __class__=class_name)
+        self.data[f"{class_name}.{obj_id}"] = fields
+        return obj_id
+
+    def generate(self, total):
+        """
+        Generates roughly total objects and returns them keyed by Class.id.
+        """
+        rng = self.rng
+        states = [self._add("State", name=self._words(1).title())
+                  for _ in range(max(1, total // 2000))]
+        cities = [self._add("City", state_id=rng.choice(states),
+                            name=self._words(2).title())
+                  for _ in range(max(1, total // 200))]
+        amenities = [self._add("Amenity", name=self._words(1).title())
+                     for _ in range(min(200, max(1, total // 500)))]
+        users = [self._add("User", email=f"user{i}@example.com",
+                           password=self._words(1),
+                           first_name=self._words(1).title(),
+                           last_name=self._words(1).title())
+                 for i in range(max(1, total // 10))]
+        places = []
+        for _ in range(max(1, total // 4)):
+            places.append(self._add(
+                "Place",
+                city_id=rng.choice(cities),
+                user_id=rng.choice(users),
+                name=self._words(3).title(),
+                description=self._words(rng.randrange(5, 40)),
+                number_rooms=rng.randrange(1, 8),
+                number_bathrooms=rng.randrange(1, 4),
+                max_guest=rng.randrange(1, 12),
+                price_by_night=rng.randrange(20, 500),
+                latitude=round(rng.uniform(-90, 90), 6),
+                longitude=round(rng.uniform(-180, 180), 6),
+                amenity_ids=rng.sample(amenities,
+                                       min(len(amenities), rng.randrange(8)))))
+        while len(self.data) < total:
+            self._add("Review", place_id=rng.choice(places),
+                      user_id=rng.choice(users),
+                      text=self._words(rng.randrange(5, 60)))
+        return self.data
+
+
+def generate(scale="10k", seed=42):
+    """
+    Returns a serialized dataset for scale and seed.
+    """
+    return DatasetGenerator(seed).generate(parse_scale(scale))
+
+
+def write_dataset(path, scale="10k", seed=42):
+    """
+    Writes a generated dataset to path in FileStorage's JSON format.
+
+    Returns:
+        dict: The generated dataset.
+    """
+    data = generate(scale, seed)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return data
+
+
+def main():
+    """
+    Command-line entry point.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", default="10k",
+                        help="10k, 100k, 1m or an object count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default="file.json")
+    args = parser.parse_args()
+    data = write_dataset(args.output, args.scale, args.seed)
+    print(f"wrote {len(data)} objects to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
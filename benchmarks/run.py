@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+
+"""
+Runs the storage and console benchmarks and writes the results as JSON.
+
+Usage:
+    python3 -m benchmarks.run --scale 100k -o results.json
+    python3 -m benchmarks.run --scale 1m --shards 8 -o sharded.json
+    python3 -m benchmarks.run compare old.json new.json --threshold 0.1
+
+The compare mode prints every benchmark whose median time grew by more
+than the threshold and exits with status 1 if there is any.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+from datetime import datetime
+from random import Random
+from time import perf_counter
+
+import console
+from models.engine.file_storage import FileStorage
+from benchmarks.generator import parse_scale, write_dataset
+
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=5):
+    """
+    Registers a benchmark function under name.
+
+    The function receives the Context and returns how many operations
+    one run performed, so results can be reported per operation.
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, repeat, func))
+        return func
+    return decorator
+
+
+class Context:
+    """
+    Shared state for a benchmark session: the dataset and a loaded storage.
+    """
+
+    def __init__(self, workdir, scale, seed, shards=None, workers=None):
+        """
+        Generates the dataset into workdir and loads it, converting it to
+        the sharded layout when shards is given.
+        """
+        self.file_path = os.path.join(workdir, "file.json")
+        self.data = write_dataset(self.file_path, scale, seed)
+        self.rng = Random(seed)
+        self.keys = sorted(self.data)
+        self.places = [key.split(".", 1)[1] for key in self.keys
+                       if key.startswith("Place.")]
+        self.storage = FileStorage(self.file_path)
+        self.storage.reload()
+        if shards:
+            sharded = FileStorage(self.file_path, shards=shards, workers=workers)
+            for obj in self.storage.all().values():
+                sharded.new(obj)
+            sharded.save()
+            self.storage = sharded
+
+    def sample(self, ids, count):
+        """
+        Returns count ids drawn from ids with the session's random stream.
+        """
+        return [self.rng.choice(ids) for _ in range(count)]
+
+
+@benchmark("storage.reload", repeat=3)
+def bench_reload(ctx):
+    """Deserializes the whole dataset from disk."""
+    ctx.storage.reload()
+    return 1
+
+
+@benchmark("storage.save", repeat=3)
+def bench_save(ctx):
+    """Serializes the whole dataset to disk."""
+    ctx.storage.save()
+    return 1
+
+
+@benchmark("storage.find_all", repeat=5)
+def bench_find_all(ctx):
+    """Lists every Place."""
+    ctx.storage.find_all("Place")
+    return 1
+
+
+@benchmark("storage.find_by_id", repeat=5)
+def bench_find_by_id(ctx):
+    """Looks up random Places by id."""
+    ids = ctx.sample(ctx.places, 10000)
+    for obj_id in ids:
+        ctx.storage.find_by_id("Place", obj_id)
+    return len(ids)
+
+
+@benchmark("storage.update_one", repeat=3)
+def bench_update_one(ctx):
+    """Updates the price of a random Place, which saves the dataset."""
+    obj_id = ctx.sample(ctx.places, 1)[0]
+    ctx.storage.update_one("Place", obj_id, "price_by_night", 100)
+    return 1
+
+
+@benchmark("console.show", repeat=5)
+def bench_console_show(ctx):
+    """Runs 'show Place <id>' through the command interpreter."""
+    ids = ctx.sample(ctx.places, 1000)
+    cmd = console.HBNBCommand()
+    with _console_storage(ctx.storage), \
+            contextlib.redirect_stdout(io.StringIO()):
+        for obj_id in ids:
+            cmd.onecmd(f"show Place {obj_id}")
+    return len(ids)
+
+
+@contextlib.contextmanager
+def _console_storage(storage):
+    """
+    Points the console module at storage for the duration of the block.
+    """
+    previous = console.storage
+    console.storage = storage
+    try:
+        yield
+    finally:
+        console.storage = previous
+
+
+def run(scale="10k", seed=42, only=None, shards=None, workers=None):
+    """
+    Runs every registered benchmark and returns the results dictionary.
+    """
+    workdir = tempfile.mkdtemp(prefix="hbnb-bench-")
+    try:
+        ctx = Context(workdir, scale, seed, shards, workers)
+        results = {}
+        for name, repeat, func in BENCHMARKS:
+            if only and name not in only:
+                continue
+            timings = []
+            for _ in range(repeat):
+                start = perf_counter()
+                ops = func(ctx)
+                timings.append((perf_counter() - start) / ops)
+            results[name] = {
+                "runs": repeat,
+                "ops": ops,
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "mean": statistics.mean(timings),
+            }
+    finally:
+        shutil.rmtree(workdir)
+    return {
+        "meta": {
+            "scale": parse_scale(scale),
+            "seed": seed,
+            "shards": shards,
+            "workers": workers,
+            "objects": len(ctx.data),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.utcnow().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare(old, new, threshold=0.1):
+    """
+    Compares two result dictionaries.
+
+    Returns:
+        list: (name, old median, new median, ratio) for every benchmark
+        whose median grew by more than threshold.
+    """
+    regressions = []
+    for name, result in sorted(new["results"].items()):
+        if name not in old["results"]:
+            continue
+        before = old["results"][name]["median"]
+        after = result["median"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((name, before, after, ratio))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "compare":
+        parser = argparse.ArgumentParser(prog="benchmarks.run compare")
+        parser.add_argument("old")
+        parser.add_argument("new")
+        parser.add_argument("--threshold", type=float, default=0.1)
+        args = parser.parse_args(argv[1:])
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.3f}ms -> "
+                  f"{after * 1000:.3f}ms ({ratio:.2f}x)")
+        if not regressions:
+            print("no regressions")
+        return 1 if regressions else 0
+
+    parser = argparse.ArgumentParser(prog="benchmarks.run")
+    parser.add_argument("--scale", default="10k",
+                        help="10k, 100k, 1m or an object count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--shards", type=int,
+                        help="benchmark the sharded layout with N shards per class")
+    parser.add_argument("--workers", type=int,
+                        help="processes used by sharded reload")
+    parser.add_argument("--only", nargs="*",
+                        help="names of the benchmarks to run")
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    args = parser.parse_args(argv)
+    results = run(args.scale, args.seed, args.only, args.shards, args.workers)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
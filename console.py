@@ -3,6 +3,8 @@
 
 from cmd import Cmd
 from models import storage
+from models.engine.errors import ModelNotFoundError, InstanceNotFoundError
+from models.engine.metrics import metrics, profiled
 import shlex
 
 # Import all model classes
@@ -29,6 +31,27 @@ class HBNBCommand(Cmd):
     """Implements the command interpreter for the HBNB project"""
     prompt = "(hbnb) "
 
+    def onecmd(self, line):
+        """Runs a single command, timing it when metrics are enabled"""
+        if not metrics.enabled:
+            return Cmd.onecmd(self, line)
+        command = self.parseline(line)[0] or "emptyline"
+        if not hasattr(self, "do_" + command):
+            command = "default"
+        with metrics.timer(f"console.{command}"):
+            return Cmd.onecmd(self, line)
+
+    def do_stats(self, args):
+        """Prints collected timers and counters; 'stats reset' clears them"""
+        args = shlex.split(args)
+        if args and args[0] == "reset":
+            metrics.reset()
+        elif not metrics.enabled:
+            print("metrics disabled (set HBNB_METRICS=1)")
+        else:
+            for line in metrics.report():
+                print(line)
+
     def do_EOF(self, args):
         """Exits the program in non-interactive mode"""
         return True
@@ -114,6 +137,8 @@ class HBNBCommand(Cmd):
                 self.print_error("class doesn't exist")
             except InstanceNotFoundError:
                 self.print_error("no instance found")
+            except ValueError:
+                self.print_error("invalid value")
 
     def default(self, args):
         """Handles class methods such as <class>.all(), <class>.show(), etc."""
@@ -152,5 +177,6 @@ class HBNBCommand(Cmd):
         print(f"** {message} **")
 
 if __name__ == "__main__":
-    HBNBCommand().cmdloop()
+    with profiled():
+        HBNBCommand().cmdloop()
 
@@ -7,8 +7,23 @@ Module initializer for global (singleton) variables and initialization routines.
 import os
 from .engine.file_storage import FileStorage
 
-# Global instance of FileStorage
-storage = FileStorage()
+
+def _shard_count():
+    """
+    Returns the shard count from HBNB_STORAGE_SHARDS, or None if unset
+    or not a positive integer.
+    """
+    value = os.getenv("HBNB_STORAGE_SHARDS", "")
+    try:
+        count = int(value or 0)
+    except ValueError:
+        print(f"Warning: ignoring invalid HBNB_STORAGE_SHARDS '{value}'.")
+        return None
+    return count if count > 0 else None
+
+
+# Global instance of FileStorage, sharded when HBNB_STORAGE_SHARDS is set
+storage = FileStorage(shards=_shard_count())
 
 def initialize_storage():
     """
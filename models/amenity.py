@@ -3,7 +3,7 @@
 Defines the Amenity model class.
 """
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Field
 
 class Amenity(BaseModel):
     """
@@ -14,9 +14,6 @@ class Amenity(BaseModel):
                    Initialized to an empty string.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initializes an instance of Amenity.
-        """
-        super().__init__(*args, **kwargs)
-        self.name = ''
+    fields = (
+        Field('name', str, ''),
+    )
@@ -6,7 +6,53 @@ Definition of the BaseModel class, the foundation for our models.
 
 from uuid import uuid4
 from datetime import datetime
+from time import perf_counter
+import json
 import models
+from models.engine.metrics import metrics
+
+
+class Field:
+    """
+    Declares a model attribute: its name, type and default value.
+    """
+
+    def __init__(self, name, type=str, default=''):
+        """
+        Initializes a field declaration.
+
+        Args:
+            name (str): Attribute name.
+            type (type): One of str, int, float or list.
+            default: Value used when the attribute is not provided.
+        """
+        self.name = name
+        self.type = type
+        self.default = default
+        self.mutable = isinstance(default, (list, dict, set))
+
+    def make_default(self):
+        """
+        Returns the default value, copied when it is mutable.
+        """
+        return self.default.copy() if self.mutable else self.default
+
+    def coerce(self, value):
+        """
+        Converts a string value to the field type.
+
+        Raises:
+            ValueError: If value cannot be converted.
+        """
+        if self.type is list:
+            try:
+                parsed = json.loads(value)
+            except ValueError:
+                parsed = [item.strip() for item in value.split(',') if item.strip()]
+            if not isinstance(parsed, list):
+                raise ValueError(f"Field '{self.name}' expects a list.")
+            return parsed
+        return self.type(value)
 
 
 class BaseModel:
@@ -14,37 +60,109 @@ class BaseModel:
     Base class for all models, providing common functionality.
     """
 
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Compiles the field schema of every model class once, at definition.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._compile_schema()
+
+    @classmethod
+    def _compile_schema(cls):
+        """
+        Collects the fields declared along the class hierarchy into the
+        lookup tables used by __init__, deserialize, to_dict and coerce.
+        """
+        schema = {}
+        for klass in reversed(cls.__mro__):
+            for field in vars(klass).get('fields', ()):
+                schema[field.name] = field
+        cls._schema = schema
+        cls._field_names = frozenset(schema)
+        cls._defaults = {name: field.default for name, field in schema.items()
+                         if not field.mutable}
+        cls._factories = tuple((name, field.make_default)
+                               for name, field in schema.items() if field.mutable)
+        cls._mutable_names = tuple(name for name, field in schema.items()
+                                   if field.mutable)
+        cls._class_name = cls.__name__
+
     def __init__(self, *args, **kwargs):
         """
         Initializes a new instance of the BaseModel.
 
-        If kwargs are provided, initializes from serialized data.
-        Otherwise, initializes with new data and stores in models.storage.
+        If kwargs contain an id, initializes from serialized data.
+        Otherwise, initializes with new data (kwargs overriding the field
+        defaults) and stores in models.storage.
 
         Args:
-            *args: Positional arguments (not used directly).
+            *args: Not accepted; fields are passed by keyword.
             **kwargs: Keyword arguments for initializing attributes.
+
+        Raises:
+            TypeError: If positional arguments are given.
         """
+        if args:
+            raise TypeError(f"{type(self).__name__}() takes fields as keyword "
+                            f"arguments, got {len(args)} positional")
+        if 'id' in kwargs:
+            self.deserialize(kwargs)
+            return
+        attrs = self.__dict__
+        attrs['id'] = str(uuid4())
+        attrs['created_at'] = attrs['updated_at'] = datetime.utcnow()
+        attrs.update(self._defaults)
+        for name, factory in self._factories:
+            attrs[name] = factory()
         if kwargs:
             self.deserialize(kwargs)
-        else:
-            self.id = str(uuid4())
-            self.created_at = self.updated_at = datetime.utcnow()
-            models.storage.new(self)
+        models.storage.new(self)
 
     def deserialize(self, data):
         """
         Deserializes data and initializes instance attributes.
 
+        Fields missing from data are set to their schema defaults.
+
         Args:
             data (dict): Dictionary containing serialized data.
         """
-        if '__class__' in data:
-            del data['__class__']
-        for key, value in data.items():
-            if key == 'created_at' or key == 'updated_at':
-                value = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
-            setattr(self, key, value)
+        data.pop('__class__', None)
+        attrs = self.__dict__
+        attrs.update(data)
+        for name in self._mutable_names:
+            value = data.get(name)
+            if isinstance(value, (list, dict, set)):
+                attrs[name] = value.copy()
+        timed = metrics.enabled
+        if timed:
+            start = perf_counter()
+        for key in ('created_at', 'updated_at'):
+            value = data.get(key)
+            if isinstance(value, str):
+                attrs[key] = datetime.fromisoformat(value)
+        if timed:
+            metrics.observe("model.parse_dates", perf_counter() - start)
+        missing = self._field_names - attrs.keys()
+        if missing:
+            for name in missing:
+                attrs[name] = self._schema[name].make_default()
+
+    @classmethod
+    def coerce(cls, name, value):
+        """
+        Converts a value given as a string (e.g. from the console) to the
+        type declared for the field name. Unknown fields are left as is.
+
+        Raises:
+            ValueError: If value cannot be converted.
+        """
+        field = cls._schema.get(name)
+        if field is None or not isinstance(value, str):
+            return value
+        return field.coerce(value)
 
     def __str__(self):
         """
@@ -60,19 +178,27 @@ class BaseModel:
         Updates the updated_at attribute and saves the instance to storage.
         """
         self.updated_at = datetime.utcnow()
+        models.storage.touch(self)
         models.storage.save()
 
     def to_dict(self):
         """
         Returns a dictionary representation of the instance.
 
+        Mutable schema fields are copied, so the result does not change
+        when the instance does.
+
         Returns:
             dict: Dictionary representation of the instance.
         """
         data = self.__dict__.copy()
-        data['__class__'] = type(self).__name__
-        data['created_at'] = self.created_at.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        data['updated_at'] = self.updated_at.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        data['__class__'] = self._class_name
+        data['created_at'] = self.created_at.isoformat(timespec='microseconds')
+        data['updated_at'] = self.updated_at.isoformat(timespec='microseconds')
+        for name in self._mutable_names:
+            value = data.get(name)
+            if isinstance(value, (list, dict, set)):
+                data[name] = value.copy()
         return data
 
     @classmethod
@@ -95,6 +221,19 @@ class BaseModel:
         """
         return models.storage.count(cls)
 
+    @classmethod
+    def history(cls, instance_id):
+        """
+        Retrieves the recorded changes of an instance of cls.
+
+        Args:
+            instance_id (str): ID of the instance.
+
+        Returns:
+            list: History entries, oldest first.
+        """
+        return models.storage.history(cls.__name__, instance_id)
+
     @classmethod
     def create(cls, *args, **kwargs):
         """
@@ -145,8 +284,11 @@ class BaseModel:
         instance = cls.show(instance_id)
         if instance:
             for key, value in kwargs.items():
-                setattr(instance, key, value)
+                setattr(instance, key, cls.coerce(key, value))
             instance.save()
         else:
             print("** no instance found **")
 
+
+BaseModel._compile_schema()
+
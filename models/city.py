@@ -4,7 +4,7 @@
 Defines the City model class, inheriting from BaseModel.
 """
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Field
 
 class City(BaseModel):
     """
@@ -15,19 +15,10 @@ class City(BaseModel):
         name (str): The name of the city.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initializes a new City instance.
-
-        Args:
-            *args: Positional arguments (not used directly).
-            **kwargs: Keyword arguments for initializing attributes:
-                - state_id (str): The state ID associated with the city.
-                - name (str): The name of the city.
-        """
-        super().__init__(*args, **kwargs)
-        self.state_id = kwargs.get('state_id', '')
-        self.name = kwargs.get('name', '')
+    fields = (
+        Field('state_id', str, ''),
+        Field('name', str, ''),
+    )
 
     def __str__(self):
         """
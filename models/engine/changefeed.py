@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+
+"""
+This file defines the change-data-capture feed of FileStorage.
+
+Every create, update and delete becomes an event:
+
+    {"seq": 42, "ts": "...", "op": "update", "key": "Place.<id>",
+     "fields": {"price_by_night": 90, "updated_at": "..."}}
+
+Events are handed to in-process subscribers, kept in a bounded ring
+buffer, and optionally appended to a JSON lines file that consumers in
+other processes can tail() from any sequence number.
+"""
+
+import json
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+
+def tail(path, after=0, follow=False, interval=0.5):
+    """
+    Yields the events of the feed file at path with seq greater than after.
+
+    Args:
+        path (str): Feed file.
+        after (int): Last sequence number already consumed.
+        follow (bool): Keep waiting for new events instead of stopping
+            at the end of the file.
+        interval (float): Seconds between polls while following.
+    """
+    while not os.path.exists(path):
+        if not follow:
+            return
+        time.sleep(interval)
+    with open(path, "r") as f:
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line.endswith("\n"):
+                # End of file, or a line still being written
+                if not follow:
+                    return
+                f.seek(position)
+                time.sleep(interval)
+                continue
+            event = json.loads(line)
+            if event["seq"] > after:
+                yield event
+
+
+def _rfind_newline(f, before):
+    """
+    Returns the offset of the last newline in f before offset before,
+    or -1 if there is none.
+    """
+    position = before
+    while position > 0:
+        start = max(0, position - 4096)
+        f.seek(start)
+        found = f.read(position - start).rfind(b"\n")
+        if found >= 0:
+            return start + found
+        position = start
+    return -1
+
+
+def _last_seq(path):
+    """
+    Returns the sequence number of the last complete event in the file at
+    path, cutting off a final line left unterminated by an interrupted
+    write so the next event starts on a line of its own.
+    """
+    try:
+        with open(path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = _rfind_newline(f, size) + 1
+            if end < size:
+                f.truncate(end)
+            if end == 0:
+                return 0
+            start = _rfind_newline(f, end - 1) + 1
+            f.seek(start)
+            return json.loads(f.read(end - start))["seq"]
+    except FileNotFoundError:
+        pass
+    return 0
+
+
+class ChangeFeed:
+    """
+    Sequenced stream of storage change events.
+    """
+
+    def __init__(self, path=None, buffer_size=1024):
+        """
+        Initializes the feed, resuming numbering from the file at path.
+
+        Args:
+            path (str): JSON lines file the events are appended to, or None
+                to keep events in memory only.
+            buffer_size (int): Number of recent events kept in memory.
+        """
+        self.path = path
+        self.seq = _last_seq(path) if path else 0
+        self.__buffer = deque(maxlen=buffer_size)
+        self.__subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Registers callback to be called with every new event.
+        """
+        self.__subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Removes a callback registered with subscribe().
+        """
+        self.__subscribers.remove(callback)
+
+    def emit(self, op, key, fields=None):
+        """
+        Publishes an event and returns it.
+
+        Args:
+            op (str): 'create', 'update' or 'delete'.
+            key (str): Class.id of the object.
+            fields (dict): Serialized values of the changed fields.
+        """
+        self.seq += 1
+        event = {
+            "seq": self.seq,
+            "ts": datetime.utcnow().isoformat(timespec='microseconds'),
+            "op": op,
+            "key": key,
+            "fields": fields or {},
+        }
+        # The buffer and each subscriber get their own copy, so neither
+        # the instance's live lists nor another consumer can alter it
+        line = json.dumps(event)
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+        event = json.loads(line)
+        self.__buffer.append(event)
+        for callback in list(self.__subscribers):
+            try:
+                callback(json.loads(line))
+            except Exception:
+                # A failing consumer must not undo the change it observed
+                traceback.print_exc(file=sys.stderr)
+        return event
+
+    def since(self, seq=0):
+        """
+        Returns the events with a sequence number greater than seq.
+
+        Raises:
+            ValueError: If those events are no longer buffered and the
+                feed has no file to read them back from.
+        """
+        if seq >= self.seq:
+            return []
+        if self.__buffer and self.__buffer[0]["seq"] <= seq + 1:
+            return [event for event in self.__buffer if event["seq"] > seq]
+        if self.path:
+            return list(tail(self.path, seq))
+        raise ValueError(f"Changes after sequence {seq} are no longer buffered.")
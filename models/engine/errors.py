@@ -14,3 +14,9 @@ class InstanceNotFoundError(Exception):
     """Exception raised when an instance is not found."""
     def __init__(self, obj_id="", model="BaseModel"):
         super().__init__(f"Instance of '{model}' with id '{obj_id}' does not exist!")
+
+
+class StorageNotLoadedError(Exception):
+    """Exception raised when saving a storage that never loaded its data."""
+    def __init__(self, path="file.json"):
+        super().__init__(f"Storage at '{path}' was never reloaded; refusing to overwrite it!")
@@ -6,9 +6,15 @@ It uses JSON format to serialize and deserialize objects.
 """
 
 import json
+import os
 from json.decoder import JSONDecodeError
 from datetime import datetime
-from .errors import ModelNotFoundError, InstanceNotFoundError
+from .changefeed import ChangeFeed
+from .errors import ModelNotFoundError, InstanceNotFoundError, StorageNotLoadedError
+from .history import AsOfView, History
+from .metrics import metrics
+from .shards import load_shards, shard_name, write_shard
+from .snapshot import Snapshot, write_snapshot
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -18,6 +24,18 @@ from models.place import Place
 from models.review import Review
 
 
+_MISSING = object()
+
+
+def _freeze(data):
+    """
+    Returns a copy of a to_dict() result whose list, dict and set values
+    are copied too, so later in-place edits of the instance don't show.
+    """
+    return {key: value.copy() if isinstance(value, (list, dict, set)) else value
+            for key, value in data.items()}
+
+
 class FileStorage:
     """
     This class serves as an object-relational mapping interface for database operations.
@@ -33,12 +51,67 @@ class FileStorage:
         "Review": Review
     }
 
-    def __init__(self, file_path='file.json'):
+    def __init__(self, file_path='file.json', snapshot_path=None,
+                 history_path=None, history_retention=None,
+                 shards=None, workers=None,
+                 changefeed_path=None, changefeed_size=1024):
         """
         Initializes FileStorage with a file path.
+
+        When snapshot_path is given, every save() also writes an indexed
+        snapshot there, and find_by_id() falls back to reading single
+        records from it for objects that have not been reloaded. Until
+        reload() or its own save(), such a storage is a read-only reader:
+        records found in the snapshot are detached copies that
+        update_one() and delete_by_id() don't see, and save() raises
+        StorageNotLoadedError instead of overwriting the existing dataset.
+
+        When history_path is given, creates, updates and deletes are
+        appended there, enabling as_of() and history(). Entries older than
+        history_retention (seconds or timedelta) are pruned on save().
+
+        When shards is given, each class is stored as that many
+        hash-partitioned files in the "<file_path>.d" directory instead
+        of file_path. save() rewrites only the shards that gained, lost or
+        touch()ed objects since the last save; when there are none it
+        rewrites every shard, so edits made without touch() still persist.
+        reload() parses and hydrates shards with up to workers processes.
+        Shards and snapshot_path can't be combined, since every save()
+        would rewrite the whole snapshot.
+
+        When changefeed_path is given, or once a callback is subscribed,
+        every create, update and delete is published as a change event.
+        The latest changefeed_size events stay available through changes().
+        With changefeed_path they are also appended to that file for other
+        processes to tail, and sequence numbers carry on from its last event.
+
+        Raises:
+            ValueError: If both shards and snapshot_path are given.
         """
+        if shards and snapshot_path:
+            raise ValueError("Sharded storage does not support snapshots.")
         self.__file_path = file_path
+        self.__snapshot_path = snapshot_path
+        self.__snapshot = None
+        self.__history = None
+        if history_path:
+            self.__history = History(history_path, history_retention)
+        self.__shards = shards
+        self.__shard_dir = f"{file_path}.d"
+        # Keys each shard held when it was last written or loaded
+        self.__shard_keys = {}
+        self.__saved_keys = set()
+        self.__dirty = set()
+        self.__workers = workers
+        self.__feed = None
+        self.__feed_size = changefeed_size
+        if changefeed_path:
+            self.__feed = ChangeFeed(changefeed_path, changefeed_size)
+        # Last recorded state of each object, kept while history or the
+        # change feed is on so touch() can tell which fields changed
+        self.__published = {}
         self.__objects = {}
+        self.__loaded = False
 
     def all(self):
         """
@@ -51,29 +124,231 @@ class FileStorage:
         Adds a new object to the __objects dictionary.
         """
         key = f"{type(obj).__name__}.{obj.id}"
+        created = key not in self.__objects
         self.__objects[key] = obj
+        if self.__shards:
+            self.__dirty.add(self._shard_of(key))
+        if created and (self.__history or self.__feed):
+            # Published once stored, so subscribers can read it back
+            state = self.__published[key] = _freeze(obj.to_dict())
+            if self.__history:
+                self.__history.record("create", key)
+            if self.__feed:
+                self.__feed.emit("create", key, state)
+
+    def touch(self, obj):
+        """
+        Marks obj as changed so the next save() writes its shard.
+
+        With history or the change feed on, obj is also compared with its
+        last recorded state, and the fields that differ (including lists
+        edited in place) are recorded as an update.
+        """
+        key = f"{type(obj).__name__}.{obj.id}"
+        if self.__shards:
+            self.__dirty.add(self._shard_of(key))
+        if not (self.__history or self.__feed) or key not in self.__objects:
+            return
+        data = _freeze(obj.to_dict())
+        previous = self.__published.get(key, {})
+        self.__published[key] = data
+        changed = [name for name, value in data.items()
+                   if previous.get(name, _MISSING) != value]
+        if not changed:
+            return
+        after = {name: data[name] for name in changed}
+        if self.__history:
+            before = {name: previous[name] for name in changed if name in previous}
+            added = [name for name in changed if name not in previous]
+            self.__history.record("update", key, before=before, after=after,
+                                  added=added or None)
+        if self.__feed:
+            self.__feed.emit("update", key, after)
+
+    def _publish_all(self):
+        """
+        Records the current state of every object as the baseline for
+        touch(), when history or the change feed is on.
+        """
+        if self.__history or self.__feed:
+            self.__published = {key: _freeze(obj.to_dict())
+                                for key, obj in self.__objects.items()}
+
+    def subscribe(self, callback):
+        """
+        Calls callback with every change event from now on.
+
+        Returns:
+            callable: callback, so this can be used as a decorator.
+        """
+        if self.__feed is None:
+            self.__feed = ChangeFeed(buffer_size=self.__feed_size)
+            if not self.__history:
+                self._publish_all()
+        return self.__feed.subscribe(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Stops calling a callback registered with subscribe().
+        """
+        if self.__feed:
+            self.__feed.unsubscribe(callback)
 
+    def changes(self, since=0):
+        """
+        Returns the change events with a sequence number above since.
+
+        Raises:
+            ValueError: If they are no longer available.
+        """
+        if self.__feed is None:
+            return []
+        return self.__feed.since(since)
+
+    def _shard_of(self, key):
+        """
+        Returns the name of the shard a Class.id key belongs to.
+        """
+        class_name, obj_id = key.split(".", 1)
+        return shard_name(class_name, obj_id, self.__shards)
+
+    @metrics.timed("storage.save")
     def save(self):
         """
         Serializes __objects and saves it to a JSON file.
+
+        Raises:
+            StorageNotLoadedError: If a snapshot exists but this storage
+                never reloaded it, so saving would drop its records.
         """
-        serialized = {key: obj.to_dict() for key, obj in self.__objects.items()}
-        with open(self.__file_path, "w") as f:
-            json.dump(serialized, f)
+        if (self.__snapshot_path and not self.__loaded
+                and os.path.exists(self.__snapshot_path)):
+            raise StorageNotLoadedError(self.__file_path)
+        if self.__shards:
+            self._save_shards()
+        else:
+            with metrics.timer("storage.save.serialize"):
+                serialized = {key: obj.to_dict() for key, obj in self.__objects.items()}
+                payload = json.dumps(serialized)
+            with open(self.__file_path, "w") as f:
+                f.write(payload)
+            metrics.incr("storage.save.bytes", len(payload))
+            metrics.incr("storage.save.objects", len(serialized))
+        if self.__snapshot_path:
+            with metrics.timer("storage.save.snapshot"):
+                metrics.incr("storage.snapshot.bytes",
+                             write_snapshot(self.__snapshot_path, serialized))
+        self.__loaded = True
+        if self.__history:
+            self.__history.maybe_prune()
+
+    def _save_shards(self):
+        """
+        Writes the shards changed since the last save, removing the ones
+        left empty, or every shard when no change was tracked.
+
+        Keys are compared with the ones last written, so objects added
+        to or removed from all() directly land in the right shards too.
+        """
+        dirty = self.__dirty
+        added = self.__objects.keys() - self.__saved_keys
+        removed = self.__saved_keys - self.__objects.keys()
+        for key in added:
+            shard = self._shard_of(key)
+            self.__shard_keys.setdefault(shard, set()).add(key)
+            dirty.add(shard)
+        for key in removed:
+            shard = self._shard_of(key)
+            self.__shard_keys[shard].discard(key)
+            dirty.add(shard)
+        self.__saved_keys |= added
+        self.__saved_keys -= removed
+        if not dirty:
+            dirty = set(self.__shard_keys)
+        os.makedirs(self.__shard_dir, exist_ok=True)
+        for shard in sorted(dirty):
+            path = os.path.join(self.__shard_dir, f"{shard}.json")
+            keys = self.__shard_keys.get(shard)
+            if not keys:
+                self.__shard_keys.pop(shard, None)
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            with metrics.timer("storage.save.shard"):
+                serialized = {key: self.__objects[key].to_dict() for key in keys}
+                metrics.incr("storage.save.bytes", write_shard(path, serialized))
+            metrics.incr("storage.save.objects", len(serialized))
+            metrics.incr("storage.save.shards")
+        self.__dirty = set()
 
+    def _reload_shards(self):
+        """
+        Loads every shard file into __objects.
+
+        Without a shard directory, the single JSON file at file_path is
+        loaded instead and no shard is recorded as written, so the next
+        save() migrates an existing install to the sharded layout.
+        """
+        try:
+            names = sorted(name for name in os.listdir(self.__shard_dir)
+                           if name.endswith(".json"))
+        except FileNotFoundError:
+            self._reload_file()
+            self.__shard_keys = {}
+            self.__saved_keys = set()
+            self.__dirty = set()
+            return
+        paths = [os.path.join(self.__shard_dir, name) for name in names]
+        # Parsed and hydrated together, in the workers when parallel
+        with metrics.timer("storage.reload.shards"):
+            contents = load_shards(paths, self._models, self.__workers)
+
+        objects = {}
+        shard_keys = {}
+        dirty = set()
+        for name, loaded in zip(names, contents):
+            objects.update(loaded)
+            for key in loaded:
+                shard = self._shard_of(key)
+                shard_keys.setdefault(shard, set()).add(key)
+                if shard != name[:-len(".json")]:
+                    # Written with another shard count: move it over
+                    dirty.update((shard, name[:-len(".json")]))
+        self.__objects = objects
+        self.__shard_keys = shard_keys
+        self.__saved_keys = set(objects)
+        self.__dirty = dirty
+        metrics.incr("storage.reload.objects", len(objects))
+
+    @metrics.timed("storage.reload")
     def reload(self):
         """
         Deserializes JSON file and loads objects into __objects.
         """
+        if self.__shards:
+            self._reload_shards()
+        else:
+            self._reload_file()
+        self.__loaded = True
+        self._publish_all()
+
+    def _reload_file(self):
+        """
+        Loads the single JSON file at file_path into __objects.
+        """
         try:
             with open(self.__file_path, "r") as f:
-                serialized = json.load(f)
-                self.__objects = {
-                    key: self._models[obj['__class__']](**obj) for key, obj in serialized.items()
-                }
+                with metrics.timer("storage.reload.json_load"):
+                    serialized = json.load(f)
+                with metrics.timer("storage.reload.hydrate"):
+                    self.__objects = {
+                        key: self._models[obj['__class__']](**obj) for key, obj in serialized.items()
+                    }
+                metrics.incr("storage.reload.objects", len(self.__objects))
         except (FileNotFoundError, JSONDecodeError):
             pass  # File doesn't exist or JSON decoding error
 
+    @metrics.timed("storage.find_by_id")
     def find_by_id(self, model_name, obj_id):
         """
         Finds and returns an object by its model name and ID.
@@ -82,11 +357,38 @@ class FileStorage:
             raise ModelNotFoundError(f"Model '{model_name}' not found.")
         
         key = f"{model_name}.{obj_id}"
-        if key not in self.__objects:
+        if key in self.__objects:
+            return self.__objects[key]
+
+        snapshot = self._snapshot()
+        data = None
+        if snapshot:
+            data = snapshot.get(key)
+            metrics.incr("storage.snapshot.hits" if data else "storage.snapshot.misses")
+        if data is None:
             raise InstanceNotFoundError(f"Instance of '{model_name}' with id '{obj_id}' not found.")
 
-        return self.__objects[key]
+        return self._models[data['__class__']](**data)
 
+    def _snapshot(self):
+        """
+        Returns the mapped snapshot, remapping it if the file was replaced.
+        Returns None when no snapshot is configured or written yet.
+        """
+        if not self.__snapshot_path:
+            return None
+        try:
+            stat = os.stat(self.__snapshot_path)
+        except FileNotFoundError:
+            return None
+        inode = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        if self.__snapshot is None or self.__snapshot.inode != inode:
+            if self.__snapshot is not None:
+                self.__snapshot.close()
+            self.__snapshot = Snapshot(self.__snapshot_path)
+        return self.__snapshot
+
+    @metrics.timed("storage.delete_by_id")
     def delete_by_id(self, model_name, obj_id):
         """
         Deletes an object by its model name and ID.
@@ -98,9 +400,17 @@ class FileStorage:
         if key not in self.__objects:
             raise InstanceNotFoundError(f"Instance of '{model_name}' with id '{obj_id}' not found.")
 
-        del self.__objects[key]
+        obj = self.__objects.pop(key)
+        self.__published.pop(key, None)
+        if self.__shards:
+            self.__dirty.add(self._shard_of(key))
+        if self.__history:
+            self.__history.record("delete", key, before=_freeze(obj.to_dict()))
+        if self.__feed:
+            self.__feed.emit("delete", key)
         self.save()
 
+    @metrics.timed("storage.find_all")
     def find_all(self, model_name=None):
         """
         Finds and returns all objects of a given model_name.
@@ -116,6 +426,7 @@ class FileStorage:
 
         return results
 
+    @metrics.timed("storage.update_one")
     def update_one(self, model_name, obj_id, field, value):
         """
         Updates a specific field of an object identified by model_name and obj_id.
@@ -129,9 +440,44 @@ class FileStorage:
 
         instance = self.__objects[key]
         if hasattr(instance, field):
-            setattr(instance, field, value)
+            setattr(instance, field, type(instance).coerce(field, value))
             instance.updated_at = datetime.utcnow()
+            self.touch(instance)
             self.save()
         else:
             raise AttributeError(f"Field '{field}' not found in instance.")
 
+    def as_of(self, timestamp):
+        """
+        Returns a read-only view with find_by_id() and find_all() that see
+        the objects as they were at timestamp (a datetime or ISO string).
+
+        Raises:
+            ValueError: If history is disabled or pruned past timestamp.
+        """
+        if not self.__history:
+            raise ValueError("History is not enabled for this storage.")
+        return AsOfView(self, self.__history, timestamp)
+
+    def history(self, model_name, obj_id):
+        """
+        Returns the recorded changes of an object, oldest first.
+        """
+        if model_name not in self._models:
+            raise ModelNotFoundError(f"Model '{model_name}' not found.")
+        if not self.__history:
+            return []
+        return self.__history.entries(f"{model_name}.{obj_id}")
+
+    def prune_history(self, older_than=None):
+        """
+        Drops history entries older than older_than (a datetime), or than
+        the configured retention when omitted.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        if not self.__history:
+            return 0
+        return self.__history.prune(older_than)
+
@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+
+"""
+This file defines the append-only history segment used by FileStorage.
+
+Every create, update and delete is appended as one JSON line holding the
+fields it changed and their previous values, plus the names of fields
+that did not exist before. Past versions are rebuilt
+by walking an object's entries backwards from its current state, so
+reading as of a timestamp never copies the dataset.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from .errors import ModelNotFoundError, InstanceNotFoundError
+
+
+def _timestamp(value):
+    """
+    Returns value (a datetime or an ISO string) as an ISO string.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='microseconds')
+    return datetime.fromisoformat(value).isoformat(timespec='microseconds')
+
+
+class History:
+    """
+    Per-object change log backed by an append-only JSON lines file.
+    """
+
+    def __init__(self, path, retention=None):
+        """
+        Initializes the history, loading the segment at path if present.
+
+        Args:
+            path (str): File the entries are appended to.
+            retention (timedelta or int): How long entries are kept, as a
+                timedelta or a number of seconds. None keeps everything.
+        """
+        if isinstance(retention, (int, float)):
+            retention = timedelta(seconds=retention)
+        self.path = path
+        self.retention = retention
+        self.horizon = None
+        self.__entries = []
+        self.__by_key = {}
+        self.__load()
+
+    def __load(self):
+        """
+        Reads the existing segment into memory.
+        """
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self.__add(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def __add(self, entry):
+        """
+        Indexes an entry in memory.
+        """
+        if entry["op"] == "prune":
+            self.horizon = entry["ts"]
+            return
+        self.__entries.append(entry)
+        self.__by_key.setdefault(entry["key"], []).append(entry)
+
+    def record(self, op, key, before=None, after=None, added=None):
+        """
+        Appends an entry for key.
+
+        Args:
+            op (str): 'create', 'update' or 'delete'.
+            key (str): Class.id of the object.
+            before (dict): Previous values of the changed fields, or the
+                whole serialized object for a delete.
+            after (dict): New values of the changed fields.
+            added (list): Names of changed fields that did not exist before.
+        """
+        entry = {"ts": _timestamp(datetime.utcnow()), "op": op, "key": key}
+        if before is not None:
+            entry["before"] = before
+        if after is not None:
+            entry["after"] = after
+        if added:
+            entry["added"] = added
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.__add(entry)
+        return entry
+
+    def entries(self, key):
+        """
+        Returns the entries recorded for key, oldest first.
+        """
+        return list(self.__by_key.get(key, ()))
+
+    def keys(self):
+        """
+        Returns every key that has history.
+        """
+        return self.__by_key.keys()
+
+    def revert(self, key, current, ts):
+        """
+        Rebuilds the serialized state of key as of ts.
+
+        Args:
+            key (str): Class.id of the object.
+            current (dict): Current serialized state, or None if deleted.
+            ts (str): ISO timestamp to rebuild.
+
+        Returns:
+            dict: The serialized state at ts, or None if it did not exist.
+        """
+        state = dict(current) if current is not None else None
+        for entry in reversed(self.__by_key.get(key, ())):
+            if entry["ts"] <= ts:
+                break
+            if entry["op"] == "create":
+                state = None
+            elif entry["op"] == "delete":
+                state = dict(entry["before"])
+            elif state is not None:
+                state.update(entry.get("before", {}))
+                for name in entry.get("added", ()):
+                    state.pop(name, None)
+        return state
+
+    def check(self, ts):
+        """
+        Raises ValueError if ts is older than the pruned horizon.
+        """
+        if self.horizon and ts < self.horizon:
+            raise ValueError(f"History before {self.horizon} has been pruned.")
+
+    def prune(self, older_than=None):
+        """
+        Drops entries older than older_than (defaults to now minus the
+        retention) and rewrites the segment.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        if older_than is None:
+            if self.retention is None:
+                return 0
+            older_than = datetime.utcnow() - self.retention
+        cutoff = _timestamp(older_than)
+        kept = [entry for entry in self.__entries if entry["ts"] >= cutoff]
+        dropped = len(self.__entries) - len(kept)
+        if not dropped:
+            return 0
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"ts": cutoff, "op": "prune"}) + "\n")
+            for entry in kept:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+        self.horizon = cutoff
+        self.__entries = []
+        self.__by_key = {}
+        for entry in kept:
+            self.__add(entry)
+        return dropped
+
+    def maybe_prune(self):
+        """
+        Prunes when the oldest entry has outlived the retention.
+        """
+        if self.retention is None or not self.__entries:
+            return 0
+        cutoff = _timestamp(datetime.utcnow() - self.retention)
+        if self.__entries[0]["ts"] < cutoff:
+            return self.prune()
+        return 0
+
+
+class AsOfView:
+    """
+    Read-only view of a FileStorage as it was at a point in time.
+    """
+
+    def __init__(self, storage, history, ts):
+        """
+        Initializes the view over storage at ts.
+        """
+        self.ts = _timestamp(ts)
+        history.check(self.ts)
+        self.__storage = storage
+        self.__history = history
+
+    def __resolve(self, key):
+        """
+        Returns the instance stored under key at the view's time, or None.
+        """
+        live = self.__storage.all().get(key)
+        if key not in self.__history.keys():
+            if live and live.created_at.isoformat(timespec='microseconds') > self.ts:
+                return None
+            return live
+        state = self.__history.revert(
+            key, live.to_dict() if live else None, self.ts)
+        if state is None:
+            return None
+        return self.__storage._models[key.split(".", 1)[0]](**state)
+
+    def find_by_id(self, model_name, obj_id):
+        """
+        Finds and returns an object as it was at the view's time.
+        """
+        if model_name not in self.__storage._models:
+            raise ModelNotFoundError(f"Model '{model_name}' not found.")
+        obj = self.__resolve(f"{model_name}.{obj_id}")
+        if obj is None:
+            raise InstanceNotFoundError(f"Instance of '{model_name}' with id '{obj_id}' not found.")
+        return obj
+
+    def find_all(self, model_name=None):
+        """
+        Finds and returns all objects of model_name at the view's time.
+        """
+        if model_name and model_name not in self.__storage._models:
+            raise ModelNotFoundError(f"Model '{model_name}' not found.")
+        prefix = f"{model_name}." if model_name else ""
+        live = self.__storage.all()
+        deleted = (key for key in self.__history.keys() if key not in live)
+        results = []
+        for keys in (live, deleted):
+            for key in keys:
+                if key.startswith(prefix):
+                    obj = self.__resolve(key)
+                    if obj is not None:
+                        results.append(obj)
+        return results
@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+
+"""
+This file defines lightweight instrumentation for storage and console.
+
+Collection is switched on with the HBNB_METRICS environment variable
+(or Metrics.enable()). While disabled, timed() and timer() only check a
+flag before running the wrapped code.
+
+Setting HBNB_PROFILE to a file path makes profiled() run its block under
+cProfile and dump the stats to that path.
+"""
+
+import cProfile
+import os
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+SAMPLE_SIZE = 1024
+
+
+class Histogram:
+    """
+    Summary of observed durations, keeping the most recent samples
+    for percentiles.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty histogram.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def observe(self, value):
+        """
+        Records a single value.
+        """
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(value)
+        else:
+            self.samples[self.count % SAMPLE_SIZE] = value
+
+    def percentile(self, pct):
+        """
+        Returns the pct percentile of the kept samples.
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        position = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[position]
+
+    def summary(self):
+        """
+        Returns a dictionary summary of the histogram.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class _NullTimer:
+    """
+    Context manager that does nothing, used while metrics are disabled.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """
+    Context manager recording the duration of its block in a registry.
+    """
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Registry of timers and counters.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initializes an empty registry.
+        """
+        self.enabled = enabled
+        self.timers = {}
+        self.counters = {}
+
+    def enable(self):
+        """
+        Starts collecting metrics.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stops collecting metrics.
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Drops everything collected so far.
+        """
+        self.timers = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        """
+        Records a duration for the timer called name.
+        """
+        histogram = self.timers.get(name)
+        if histogram is None:
+            histogram = self.timers[name] = Histogram()
+        histogram.observe(seconds)
+
+    def incr(self, name, amount=1):
+        """
+        Adds amount to the counter called name.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timer(self, name):
+        """
+        Times the enclosed block under name.
+
+        While disabled this returns a shared no-op context manager, so no
+        object is built per call.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """
+        Decorator timing every call of the wrapped function under name.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """
+        Returns the collected timers and counters as a dictionary.
+        """
+        return {
+            "timers": {name: histogram.summary()
+                       for name, histogram in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def report(self):
+        """
+        Returns the collected metrics as printable lines.
+        """
+        lines = []
+        for name, stats in self.snapshot()["timers"].items():
+            lines.append(
+                "{:<28} n={:<7} mean={:.3f}ms p50={:.3f}ms p95={:.3f}ms "
+                "p99={:.3f}ms max={:.3f}ms".format(
+                    name, stats["count"], stats["mean"] * 1000,
+                    stats["p50"] * 1000, stats["p95"] * 1000,
+                    stats["p99"] * 1000, stats["max"] * 1000))
+        for name, value in self.snapshot()["counters"].items():
+            lines.append(f"{name:<28} {value}")
+        return lines
+
+
+@contextmanager
+def profiled(path=None):
+    """
+    Runs the enclosed block under cProfile when HBNB_PROFILE (or path)
+    is set, dumping the stats to that file.
+    """
+    path = path or os.getenv("HBNB_PROFILE")
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def _env_flag(name):
+    """
+    Returns whether the environment variable name is set to a true value.
+    """
+    return os.getenv(name, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+metrics = Metrics(enabled=_env_flag("HBNB_METRICS"))
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+"""
+This file defines the helpers behind FileStorage's sharded layout.
+
+Each class is split into a fixed number of JSON files, picked by a
+stable hash of the object id, so a change only rewrites the shard that
+holds it. Shards are independent documents, which lets reload() parse
+and hydrate them in a process pool.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from json.decoder import JSONDecodeError
+from zlib import crc32
+
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+def shard_name(class_name, obj_id, count):
+    """
+    Returns the name of the shard holding obj_id among count shards.
+    """
+    return f"{class_name}.{crc32(obj_id.encode('utf-8')) % count}"
+
+
+def load_shard(path, models):
+    """
+    Reads a shard and builds its model instances.
+
+    Runs inside worker processes, which hand the instances back pickled;
+    unpickling them is cheaper for the parent than hydrating dictionaries.
+
+    Args:
+        path (str): Shard file.
+        models (dict): Model classes by name.
+
+    Returns:
+        dict: The instances of the shard by Class.id key.
+    """
+    try:
+        with open(path, "r") as f:
+            serialized = json.load(f)
+    except (FileNotFoundError, JSONDecodeError):
+        return {}
+    return {key: models[obj['__class__']](**obj) for key, obj in serialized.items()}
+
+
+def load_shards(paths, models, workers=None):
+    """
+    Reads every shard in paths, in parallel when there is enough data
+    to pay for the worker processes.
+
+    Returns:
+        list: The instances of each path, in order.
+    """
+    load = partial(load_shard, models=models)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(paths) > 1:
+        size = sum(os.path.getsize(path) for path in paths)
+        if size >= PARALLEL_MIN_BYTES:
+            with ProcessPoolExecutor(min(workers, len(paths))) as pool:
+                return list(pool.map(load, paths))
+    return [load(path) for path in paths]
+
+
+def write_shard(path, serialized):
+    """
+    Atomically writes a shard.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    payload = json.dumps(serialized)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+
+"""
+This file defines the memory-mapped snapshot format used by FileStorage.
+
+A snapshot is laid out as:
+
+    header   magic (8 bytes) + record count (8 bytes, little endian)
+    index    one fixed-width entry per record, sorted by key:
+             key (64 bytes, NUL padded) + offset (8 bytes) + length (4 bytes)
+    records  the JSON encoded records, back to back
+
+Looking up a key is a binary search over the index straight from the
+mapped region, so a single record can be decoded without parsing the
+rest of the file.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"HBNBSNP1"
+HEADER = struct.Struct("<8sQ")
+ENTRY = struct.Struct("<64sQI")
+KEY_SIZE = 64
+
+
+def write_snapshot(path, serialized):
+    """
+    Writes a dictionary of serialized objects to path as a snapshot.
+
+    The file is written next to path and moved into place, so readers
+    that still map the previous snapshot keep a consistent view.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    keys = sorted(serialized)
+    index = []
+    records = []
+    offset = HEADER.size + ENTRY.size * len(keys)
+    for key in keys:
+        raw_key = key.encode("utf-8")
+        if len(raw_key) > KEY_SIZE:
+            raise ValueError(f"Key '{key}' is too long for a snapshot.")
+        record = json.dumps(serialized[key]).encode("utf-8")
+        index.append(ENTRY.pack(raw_key, offset, len(record)))
+        records.append(record)
+        offset += len(record)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(keys)))
+        f.write(b"".join(index))
+        f.write(b"".join(records))
+    os.replace(tmp_path, path)
+    return offset
+
+
+class Snapshot:
+    """
+    Read-only view over a snapshot file, backed by mmap.
+    """
+
+    def __init__(self, path):
+        """
+        Maps the snapshot at path into memory.
+        """
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.__mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__mm)
+        magic, self.__count = HEADER.unpack_from(self.__mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a snapshot file.")
+        self.path = path
+        self.inode = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+
+    def __len__(self):
+        """
+        Returns the number of records in the snapshot.
+        """
+        return self.__count
+
+    def __entry(self, position):
+        """
+        Returns the (key, offset, length) entry at position in the index.
+        """
+        return ENTRY.unpack_from(self.__mm, HEADER.size + ENTRY.size * position)
+
+    def lookup(self, key):
+        """
+        Returns the raw record bytes stored under key, or None.
+        """
+        target = key.encode("utf-8").ljust(KEY_SIZE, b"\0")
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = self.__entry(middle)
+            if entry_key < target:
+                low = middle + 1
+            elif entry_key > target:
+                high = middle
+            else:
+                return self.__view[offset:offset + length]
+        return None
+
+    def get(self, key):
+        """
+        Decodes and returns the record stored under key, or None.
+        """
+        record = self.lookup(key)
+        if record is None:
+            return None
+        return json.loads(bytes(record))
+
+    def close(self):
+        """
+        Releases the mapping.
+        """
+        self.__view.release()
+        self.__mm.close()
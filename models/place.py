@@ -4,8 +4,7 @@
 Defines the Place model class, inheriting from BaseModel.
 """
 
-from models.base_model import BaseModel
-from typing import List
+from models.base_model import BaseModel, Field
 
 class Place(BaseModel):
     """
@@ -25,37 +24,19 @@ class Place(BaseModel):
         amenity_ids (List[str]): List of IDs of amenities available at the place.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initializes a new instance of Place.
-
-        Args:
-            *args: Positional arguments (not used directly).
-            **kwargs: Keyword arguments for initializing attributes:
-                city_id (str): ID of the city associated with the place.
-                user_id (str): ID of the user who owns the place.
-                name (str): Name of the place.
-                description (str): Description of the place.
-                number_rooms (int): Number of rooms in the place.
-                number_bathrooms (int): Number of bathrooms in the place.
-                max_guest (int): Maximum number of guests the place can accommodate.
-                price_by_night (int): Price per night for staying at the place.
-                latitude (float): Latitude coordinate of the place.
-                longitude (float): Longitude coordinate of the place.
-                amenity_ids (List[str]): List of IDs of amenities available at the place.
-        """
-        super().__init__(*args, **kwargs)
-        self.city_id = kwargs.get('city_id', '')
-        self.user_id = kwargs.get('user_id', '')
-        self.name = kwargs.get('name', '')
-        self.description = kwargs.get('description', '')
-        self.number_rooms = kwargs.get('number_rooms', 0)
-        self.number_bathrooms = kwargs.get('number_bathrooms', 0)
-        self.max_guest = kwargs.get('max_guest', 0)
-        self.price_by_night = kwargs.get('price_by_night', 0)
-        self.latitude = kwargs.get('latitude', 0.0)
-        self.longitude = kwargs.get('longitude', 0.0)
-        self.amenity_ids = kwargs.get('amenity_ids', [])
+    fields = (
+        Field('city_id', str, ''),
+        Field('user_id', str, ''),
+        Field('name', str, ''),
+        Field('description', str, ''),
+        Field('number_rooms', int, 0),
+        Field('number_bathrooms', int, 0),
+        Field('max_guest', int, 0),
+        Field('price_by_night', int, 0),
+        Field('latitude', float, 0.0),
+        Field('longitude', float, 0.0),
+        Field('amenity_ids', list, []),
+    )
 
     def __str__(self):
         """
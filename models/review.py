@@ -4,7 +4,7 @@
 Defines the Review model class, inheriting from BaseModel.
 """
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Field
 
 class Review(BaseModel):
     """
@@ -16,21 +16,11 @@ class Review(BaseModel):
         text (str): Content of the review text.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initializes a new instance of Review.
-
-        Args:
-            *args: Positional arguments (not used directly).
-            **kwargs: Keyword arguments for initializing attributes:
-                - place_id (str): ID of the place associated with the review.
-                - user_id (str): ID of the user who wrote the review.
-                - text (str): Content of the review text.
-        """
-        super().__init__(*args, **kwargs)
-        self.place_id = kwargs.get('place_id', '')
-        self.user_id = kwargs.get('user_id', '')
-        self.text = kwargs.get('text', '')
+    fields = (
+        Field('place_id', str, ''),
+        Field('user_id', str, ''),
+        Field('text', str, ''),
+    )
 
     def __str__(self):
         """
@@ -3,17 +3,17 @@
 User Model definition inheriting from BaseModel.
 """
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Field
 
-class UserModel(BaseModel):
+class User(BaseModel):
     """User Model class."""
 
-    def __init__(self, email='', password='', first_name='', last_name=''):
-        super().__init__()
-        self.email = email
-        self.password = password
-        self.first_name = first_name
-        self.last_name = last_name
+    fields = (
+        Field('email', str, ''),
+        Field('password', str, ''),
+        Field('first_name', str, ''),
+        Field('last_name', str, ''),
+    )
 
     def __str__(self):
         return f"User: {self.email}, {self.first_name} {self.last_name}"
@@ -29,9 +29,12 @@ class UserModel(BaseModel):
         if last_name:
             self.last_name = last_name
 
+
+UserModel = User
+
 # Example usage:
 if __name__ == "__main__":
-    user = UserModel(email='example@example.com', password='securepassword', first_name='John', last_name='Doe')
+    user = User(email='example@example.com', password='securepassword', first_name='John', last_name='Doe')
     print(user)
     user.update_info(password='newpassword')
     print(user)
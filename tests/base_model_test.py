@@ -10,6 +10,7 @@ from models.base_model import BaseModel
 from models.state import State
 from models.city import City
 from models.amenity import Amenity
+from models.place import Place
 from models.review import Review
 
 class TestBaseModel(unittest.TestCase):
@@ -91,6 +92,54 @@ class TestModels(unittest.TestCase):
         self.assertEqual(review.text, "Good")
 
 
+class TestSchema(unittest.TestCase):
+    """Unit tests for declarative model field schemas."""
+
+    def test_defaults_are_applied(self):
+        """Test that new and deserialized instances get field defaults."""
+        place = Place()
+        self.assertEqual(place.number_rooms, 0)
+        self.assertEqual(place.amenity_ids, [])
+        self.assertIsNot(place.amenity_ids, Place().amenity_ids)
+        loaded = Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                       updated_at="2024-01-01T00:00:00.000000", name="Narnia")
+        self.assertEqual(loaded.name, "Narnia")
+        self.assertEqual(loaded.latitude, 0.0)
+        self.assertEqual(loaded.created_at, datetime(2024, 1, 1))
+
+    def test_to_dict_round_trip(self):
+        """Test that to_dict output rebuilds an equal instance."""
+        place = Place(name="Narnia", price_by_night=40)
+        clone = Place(**place.to_dict())
+        self.assertEqual(clone.__dict__, place.__dict__)
+
+    def test_to_dict_copies_mutable_fields(self):
+        """Test that to_dict output does not follow later in-place edits."""
+        place = Place()
+        data = place.to_dict()
+        place.add_amenity("a1")
+        self.assertEqual(data["amenity_ids"], [])
+        clone = Place(**data)
+        clone.add_amenity("a2")
+        self.assertEqual(data["amenity_ids"], [])
+
+    def test_positional_arguments_are_rejected(self):
+        """Test that fields can't be passed positionally."""
+        with self.assertRaises(TypeError):
+            State("Kenya")
+        self.assertEqual(State(name="Kenya").name, "Kenya")
+
+    def test_coerce(self):
+        """Test that string values are converted to the declared type."""
+        self.assertEqual(Place.coerce("number_rooms", "3"), 3)
+        self.assertEqual(Place.coerce("latitude", "1.5"), 1.5)
+        self.assertEqual(Place.coerce("amenity_ids", "a, b"), ["a", "b"])
+        self.assertEqual(Place.coerce("name", "3"), "3")
+        self.assertEqual(Place.coerce("unknown", "3"), "3")
+        with self.assertRaises(ValueError):
+            Place.coerce("price_by_night", "cheap")
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the benchmark dataset generator and result comparison.
+"""
+
+import unittest
+
+from benchmarks.generator import generate, parse_scale
+from benchmarks.run import compare
+
+
+class TestGenerator(unittest.TestCase):
+    """Unit tests for the seeded dataset generator."""
+
+    def test_same_seed_same_dataset(self):
+        """Test that a seed always produces the same objects."""
+        self.assertEqual(generate(2000, seed=1), generate(2000, seed=1))
+        self.assertNotEqual(generate(2000, seed=1), generate(2000, seed=2))
+
+    def test_graph_is_consistent(self):
+        """Test the object count and that references point at real objects."""
+        data = generate(2000, seed=1)
+        self.assertEqual(len(data), 2000)
+        self.assertEqual(parse_scale("100k"), 100000)
+        for obj in data.values():
+            if obj["__class__"] == "Place":
+                self.assertIn(f"City.{obj['city_id']}", data)
+                for amenity_id in obj["amenity_ids"]:
+                    self.assertIn(f"Amenity.{amenity_id}", data)
+            elif obj["__class__"] == "Review":
+                self.assertIn(f"Place.{obj['place_id']}", data)
+
+
+class TestCompare(unittest.TestCase):
+    """Unit tests for regression detection between two runs."""
+
+    def test_flags_only_slower_benchmarks(self):
+        """Test that only medians above the threshold are reported."""
+        old = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+        new = {"results": {"a": {"median": 1.05}, "b": {"median": 1.5}}}
+        self.assertEqual([r[0] for r in compare(old, new, 0.1)], ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for FileStorage and its snapshot format.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from models.engine.file_storage import FileStorage
+from models.engine.errors import InstanceNotFoundError, StorageNotLoadedError
+from models.engine import shards
+from models.engine.changefeed import tail
+from models.engine import metrics as metrics_module
+from models.engine.metrics import Metrics, metrics
+from models.engine.snapshot import Snapshot, write_snapshot
+from models.place import Place
+
+
+class TestSnapshot(unittest.TestCase):
+    """Unit tests for the memory-mapped snapshot file."""
+
+    def setUp(self):
+        """Create a scratch directory for snapshot files."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.snap")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp)
+
+    def test_lookup_single_record(self):
+        """Test that records are found by key and missing keys return None."""
+        serialized = {f"City.{i}": {"id": str(i), "n": i} for i in range(50)}
+        write_snapshot(self.path, serialized)
+        snapshot = Snapshot(self.path)
+        self.assertEqual(len(snapshot), 50)
+        self.assertEqual(snapshot.get("City.7"), {"id": "7", "n": 7})
+        self.assertEqual(snapshot.get("City.49"), {"id": "49", "n": 49})
+        self.assertIsNone(snapshot.get("City.50"))
+        self.assertIsNone(snapshot.get("Place.7"))
+        snapshot.close()
+
+    def test_find_by_id_without_reload(self):
+        """Test that find_by_id reads from the snapshot of another storage."""
+        file_path = os.path.join(self.tmp, "file.json")
+        writer = FileStorage(file_path, snapshot_path=self.path)
+        place = Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                      updated_at="2024-01-01T00:00:00.000000", name="Narnia")
+        writer.new(place)
+        writer.save()
+
+        reader = FileStorage(file_path, snapshot_path=self.path)
+        found = reader.find_by_id("Place", "p1")
+        self.assertIsInstance(found, Place)
+        self.assertEqual(found.name, "Narnia")
+        self.assertEqual(reader.all(), {})
+        with self.assertRaises(InstanceNotFoundError):
+            reader.find_by_id("Place", "p2")
+
+    def test_reader_is_read_only_until_reload(self):
+        """Test that a snapshot reader can't overwrite the dataset."""
+        file_path = os.path.join(self.tmp, "file.json")
+        writer = FileStorage(file_path, snapshot_path=self.path)
+        writer.new(Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                         updated_at="2024-01-01T00:00:00.000000"))
+        writer.save()
+        writer.save()
+
+        reader = FileStorage(file_path, snapshot_path=self.path)
+        reader.find_by_id("Place", "p1")
+        with self.assertRaises(StorageNotLoadedError):
+            reader.save()
+        with self.assertRaises(InstanceNotFoundError):
+            reader.update_one("Place", "p1", "name", "Narnia")
+        self.assertEqual(len(Snapshot(self.path)), 1)
+
+        reader.reload()
+        reader.update_one("Place", "p1", "name", "Narnia")
+        self.assertEqual(Snapshot(self.path).get("Place.p1")["name"], "Narnia")
+
+
+class TestMetrics(unittest.TestCase):
+    """Unit tests for storage instrumentation."""
+
+    def tearDown(self):
+        """Leave the global registry disabled and empty."""
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_registry_records_nothing(self):
+        """Test that a disabled registry ignores timers and counters."""
+        registry = Metrics()
+        with registry.timer("block"):
+            pass
+        registry.timed("call")(len)([])
+        registry.incr("counter")
+        self.assertEqual(registry.snapshot(), {"timers": {}, "counters": {}})
+
+    def test_environment_flag(self):
+        """Test that HBNB_METRICS=0 or false leaves metrics disabled."""
+        previous = os.environ.get("HBNB_METRICS")
+        self.addCleanup(os.environ.pop, "HBNB_METRICS", None)
+        if previous is not None:
+            self.addCleanup(os.environ.__setitem__, "HBNB_METRICS", previous)
+        for value, expected in (("0", False), ("false", False), ("", False),
+                                ("1", True), ("yes", True)):
+            os.environ["HBNB_METRICS"] = value
+            self.assertIs(metrics_module._env_flag("HBNB_METRICS"), expected)
+
+    def test_save_is_timed_and_counted(self):
+        """Test that FileStorage.save reports its duration and size."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        storage = FileStorage(os.path.join(tmp, "file.json"))
+        storage.new(Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                          updated_at="2024-01-01T00:00:00.000000"))
+        metrics.enable()
+        storage.save()
+        stats = metrics.snapshot()
+        self.assertEqual(stats["timers"]["storage.save"]["count"], 1)
+        self.assertEqual(stats["counters"]["storage.save.objects"], 1)
+        self.assertEqual(stats["counters"]["storage.save.bytes"],
+                         os.path.getsize(os.path.join(tmp, "file.json")))
+
+
+class TestHistory(unittest.TestCase):
+    """Unit tests for versioned storage and time-travel reads."""
+
+    def setUp(self):
+        """Create a storage with history in a scratch directory."""
+        self.tmp = tempfile.mkdtemp()
+        self.history_path = os.path.join(self.tmp, "file.json.history")
+        self.storage = FileStorage(os.path.join(self.tmp, "file.json"),
+                                   history_path=self.history_path)
+        self.place = Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                           updated_at="2024-01-01T00:00:00.000000",
+                           price_by_night=40)
+        self.storage.new(self.place)
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp)
+
+    def test_as_of_sees_old_values(self):
+        """Test that reads as of a past time see overwritten and deleted data."""
+        time.sleep(0.001)
+        before_update = datetime.utcnow()
+        time.sleep(0.001)
+        self.storage.update_one("Place", "p1", "price_by_night", "90")
+        time.sleep(0.001)
+        after_update = datetime.utcnow()
+        time.sleep(0.001)
+        self.storage.delete_by_id("Place", "p1")
+
+        past = self.storage.as_of(before_update)
+        self.assertEqual(past.find_by_id("Place", "p1").price_by_night, 40)
+        middle = self.storage.as_of(after_update)
+        self.assertEqual(middle.find_by_id("Place", "p1").price_by_night, 90)
+        self.assertEqual(len(middle.find_all("Place")), 1)
+        self.assertEqual(self.storage.as_of(datetime.utcnow()).find_all(), [])
+        with self.assertRaises(InstanceNotFoundError):
+            self.storage.as_of(datetime(2000, 1, 1)).find_by_id("Place", "p1")
+
+    def test_history_survives_restart(self):
+        """Test that history is read back from the segment file."""
+        self.storage.update_one("Place", "p1", "price_by_night", "90")
+        reopened = FileStorage(os.path.join(self.tmp, "file.json"),
+                               history_path=self.history_path)
+        ops = [entry["op"] for entry in reopened.history("Place", "p1")]
+        self.assertEqual(ops, ["create", "update"])
+        update = reopened.history("Place", "p1")[1]
+        self.assertEqual(update["before"]["price_by_night"], 40)
+        self.assertEqual(update["after"]["price_by_night"], 90)
+
+    def test_as_of_sees_in_place_edits(self):
+        """Test that list fields edited in place are versioned on save."""
+        self.storage.update_one("Place", "p1", "name", "Narnia")
+        time.sleep(0.001)
+        before_edit = datetime.utcnow()
+        time.sleep(0.001)
+        self.place.add_amenity("a1")
+        self.storage.touch(self.place)
+        self.assertEqual(self.storage.history("Place", "p1")[-1]["before"],
+                         {"amenity_ids": []})
+        past = self.storage.as_of(before_edit).find_by_id("Place", "p1")
+        self.assertEqual(past.amenity_ids, [])
+        self.assertEqual(past.name, "Narnia")
+
+    def test_as_of_drops_added_attributes(self):
+        """Test that attributes added later are absent from older versions."""
+        time.sleep(0.001)
+        before_add = datetime.utcnow()
+        time.sleep(0.001)
+        self.place.foo = "bar"
+        self.storage.touch(self.place)
+        self.assertEqual(self.storage.history("Place", "p1")[-1]["added"], ["foo"])
+        past = self.storage.as_of(before_add).find_by_id("Place", "p1")
+        self.assertFalse(hasattr(past, "foo"))
+        self.assertEqual(self.storage.as_of(datetime.utcnow())
+                         .find_by_id("Place", "p1").foo, "bar")
+
+    def test_prune(self):
+        """Test that pruning drops old entries and blocks reads before them."""
+        self.storage.update_one("Place", "p1", "price_by_night", "90")
+        cutoff = datetime.utcnow() + timedelta(seconds=1)
+        self.assertEqual(self.storage.prune_history(cutoff), 2)
+        self.assertEqual(self.storage.history("Place", "p1"), [])
+        with self.assertRaises(ValueError):
+            self.storage.as_of(datetime.utcnow())
+
+
+class TestShards(unittest.TestCase):
+    """Unit tests for the per-class sharded layout."""
+
+    def setUp(self):
+        """Create a sharded storage holding a few places."""
+        self.tmp = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp, "file.json")
+        self.storage = FileStorage(self.file_path, shards=4)
+        for i in range(20):
+            self.storage.new(Place(id=f"p{i}", created_at="2024-01-01T00:00:00.000000",
+                                   updated_at="2024-01-01T00:00:00.000000"))
+        self.storage.save()
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp)
+
+    def shard_files(self):
+        """Return the shard file names and their modification times."""
+        shard_dir = f"{self.file_path}.d"
+        return {name: os.stat(os.path.join(shard_dir, name)).st_mtime_ns
+                for name in os.listdir(shard_dir)}
+
+    def test_reload_round_trip(self):
+        """Test that every object comes back from the shard files."""
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertEqual(len(self.shard_files()), 4)
+        reloaded = FileStorage(self.file_path, shards=4)
+        reloaded.reload()
+        self.assertEqual(sorted(reloaded.all()), sorted(self.storage.all()))
+
+    def test_only_dirty_shards_are_written(self):
+        """Test that an update rewrites only the shard holding the object."""
+        before = self.shard_files()
+        time.sleep(0.01)
+        self.storage.update_one("Place", "p3", "name", "Narnia")
+        after = self.shard_files()
+        changed = [name for name in after if after[name] != before[name]]
+        self.assertEqual(changed, [f"{shards.shard_name('Place', 'p3', 4)}.json"])
+
+    def test_untracked_changes_are_saved(self):
+        """Test that edits and inserts made without touch() reach disk."""
+        place = self.storage.find_by_id("Place", "p3")
+        place.add_amenity("a1")
+        place.name = "Narnia"
+        self.storage.save()
+        added = Place(id="q1", created_at="2024-01-01T00:00:00.000000",
+                      updated_at="2024-01-01T00:00:00.000000")
+        self.storage.all()["Place.q1"] = added
+        self.storage.update_one("Place", "q1", "name", "Added")
+        reloaded = FileStorage(self.file_path, shards=4)
+        reloaded.reload()
+        self.assertEqual(reloaded.find_by_id("Place", "p3").amenity_ids, ["a1"])
+        self.assertEqual(reloaded.find_by_id("Place", "p3").name, "Narnia")
+        self.assertEqual(reloaded.find_by_id("Place", "q1").name, "Added")
+
+        self.storage.delete_by_id("Place", "q1")
+        reloaded.reload()
+        self.assertNotIn("Place.q1", reloaded.all())
+
+    def test_migrates_single_file(self):
+        """Test that a sharded storage picks up and migrates file.json."""
+        plain = FileStorage(self.file_path)
+        for obj in self.storage.all().values():
+            plain.new(obj)
+        plain.save()
+        shutil.rmtree(f"{self.file_path}.d")
+
+        sharded = FileStorage(self.file_path, shards=4)
+        sharded.reload()
+        self.assertEqual(len(sharded.all()), 20)
+        sharded.save()
+        reloaded = FileStorage(self.file_path, shards=4)
+        reloaded.reload()
+        self.assertEqual(sorted(reloaded.all()), sorted(self.storage.all()))
+
+    def test_reshard_and_parallel_load(self):
+        """Test reloading with another shard count and worker processes."""
+        previous = shards.PARALLEL_MIN_BYTES
+        shards.PARALLEL_MIN_BYTES = 0
+        self.addCleanup(setattr, shards, "PARALLEL_MIN_BYTES", previous)
+        resharded = FileStorage(self.file_path, shards=2, workers=2)
+        resharded.reload()
+        self.assertEqual(len(resharded.all()), 20)
+        resharded.save()
+        self.assertEqual(sorted(self.shard_files()), ["Place.0.json", "Place.1.json"])
+
+    def test_rejects_snapshot(self):
+        """Test that shards and a snapshot can't be combined."""
+        with self.assertRaises(ValueError):
+            FileStorage(self.file_path, shards=4,
+                        snapshot_path=os.path.join(self.tmp, "file.snap"))
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Unit tests for change events published by FileStorage."""
+
+    def setUp(self):
+        """Create a storage with an on-disk feed and a subscriber."""
+        self.tmp = tempfile.mkdtemp()
+        self.feed_path = os.path.join(self.tmp, "file.json.changes")
+        self.storage = FileStorage(os.path.join(self.tmp, "file.json"),
+                                   changefeed_path=self.feed_path,
+                                   changefeed_size=2)
+        self.events = []
+        self.storage.subscribe(self.events.append)
+        self.place = Place(id="p1", created_at="2024-01-01T00:00:00.000000",
+                           updated_at="2024-01-01T00:00:00.000000")
+        self.storage.new(self.place)
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp)
+
+    def test_mutations_emit_events(self):
+        """Test that create, update_one, save and delete are published."""
+        self.storage.update_one("Place", "p1", "number_rooms", "3")
+        self.place.name = "Narnia"
+        self.storage.touch(self.place)
+        self.storage.delete_by_id("Place", "p1")
+        self.assertEqual([(e["seq"], e["op"]) for e in self.events],
+                         [(1, "create"), (2, "update"), (3, "update"), (4, "delete")])
+        self.assertEqual(self.events[1]["fields"]["number_rooms"], 3)
+        self.assertEqual(sorted(self.events[2]["fields"]), ["name"])
+
+    def test_subscribers_see_applied_changes(self):
+        """Test that events are published after storage reflects them."""
+        seen = []
+        self.storage.subscribe(
+            lambda event: seen.append((event["op"], event["key"] in self.storage.all())))
+        self.storage.new(Place(id="p2", created_at="2024-01-01T00:00:00.000000",
+                               updated_at="2024-01-01T00:00:00.000000"))
+        self.storage.update_one("Place", "p2", "name", "Narnia")
+        self.storage.delete_by_id("Place", "p2")
+        self.assertEqual(seen, [("create", True), ("update", True), ("delete", False)])
+
+    def test_in_place_edits_are_detected(self):
+        """Test that touch() diffs list fields edited in place."""
+        self.place.add_amenity("a1")
+        self.storage.touch(self.place)
+        self.storage.touch(self.place)
+        self.assertEqual([e["op"] for e in self.events], ["create", "update"])
+        self.assertEqual(self.events[1]["fields"], {"amenity_ids": ["a1"]})
+
+    def test_events_are_isolated(self):
+        """Test that events don't share lists with the instance or each other."""
+        self.events[0]["fields"]["amenity_ids"].append("x")
+        self.place.add_amenity("a1")
+        self.assertEqual(self.storage.changes()[0]["fields"]["amenity_ids"], [])
+
+    def test_resume_from_sequence(self):
+        """Test reading changes back from the buffer, the file and a restart."""
+        for rooms in ("1", "2", "3"):
+            self.storage.update_one("Place", "p1", "number_rooms", rooms)
+        self.assertEqual([e["seq"] for e in self.storage.changes(2)], [3, 4])
+        self.assertEqual([e["seq"] for e in self.storage.changes(0)], [1, 2, 3, 4])
+        self.assertEqual([e["seq"] for e in tail(self.feed_path, 3)], [4])
+
+        reopened = FileStorage(os.path.join(self.tmp, "file.json"),
+                               changefeed_path=self.feed_path)
+        reopened.new(Place(id="p2", created_at="2024-01-01T00:00:00.000000",
+                           updated_at="2024-01-01T00:00:00.000000"))
+        self.assertEqual([e["seq"] for e in reopened.changes(4)], [5])
+
+    def test_torn_last_line(self):
+        """Test that a feed ending in a partial event is resumed past it."""
+        self.storage.update_one("Place", "p1", "number_rooms", "1")
+        with open(self.feed_path, "a") as f:
+            f.write('{"seq": 3, "op": "upd')
+        reopened = FileStorage(os.path.join(self.tmp, "file.json"),
+                               changefeed_path=self.feed_path)
+        reopened.new(Place(id="p2", created_at="2024-01-01T00:00:00.000000",
+                           updated_at="2024-01-01T00:00:00.000000"))
+        self.assertEqual([e["seq"] for e in tail(self.feed_path)], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the web_static listings renderer.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from web_static.renderer import Renderer
+
+
+def make(cls, obj_id, **fields):
+    """Build a deserialized instance that is not registered globally."""
+    return cls(id=obj_id, created_at="2024-01-01T00:00:00.000000",
+               updated_at="2024-01-01T00:00:00.000000", **fields)
+
+
+class TestRenderer(unittest.TestCase):
+    """Unit tests for full and incremental page rendering."""
+
+    def setUp(self):
+        """Fill a scratch storage with two cities and render them."""
+        self.tmp = tempfile.mkdtemp()
+        self.storage = FileStorage(os.path.join(self.tmp, "file.json"))
+        for obj in (make(State, "s1", name="Lagos"),
+                    make(City, "c1", state_id="s1", name="Ikeja"),
+                    make(City, "c2", state_id="s1", name="Lekki"),
+                    make(User, "u1", first_name="Captain", last_name="Barbosa"),
+                    make(Place, "p1", city_id="c1", user_id="u1",
+                         name="Narnia", price_by_night=40),
+                    make(Review, "r1", place_id="p1", user_id="u1", text="Cold")):
+            self.storage.new(obj)
+        self.output = os.path.join(self.tmp, "site")
+        self.renderer = Renderer(self.storage, self.output, workers=1)
+        self.pages = self.renderer.build()
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.tmp)
+
+    def read(self, page):
+        """Return the content of a rendered page."""
+        with open(os.path.join(self.output, page)) as f:
+            return f.read()
+
+    def test_build(self):
+        """Test that a full build writes the index and every city page."""
+        self.assertEqual(sorted(self.pages),
+                         ["cities/c1.html", "cities/c2.html", "index.html"])
+        page = self.read("cities/c1.html")
+        self.assertIn("Narnia", page)
+        self.assertIn("Price: $40 per night", page)
+        self.assertIn("Owner: Captain Barbosa", page)
+        self.assertIn("Captain Barbosa: Cold", page)
+
+    def test_update_renders_only_affected_pages(self):
+        """Test that changes re-render just the pages that use them."""
+        self.storage.all()["User.u1"].first_name = "Davy"
+        self.assertEqual(self.renderer.update(["User.u1"]), ["cities/c1.html"])
+        self.assertIn("Owner: Davy Barbosa", self.read("cities/c1.html"))
+
+        self.storage.all()["Place.p1"].city_id = "c2"
+        self.assertEqual(self.renderer.update(["Place.p1"]),
+                         ["cities/c1.html", "cities/c2.html"])
+        self.assertNotIn("Narnia", self.read("cities/c1.html"))
+        self.assertIn("Narnia", self.read("cities/c2.html"))
+
+    def test_refresh_detects_new_and_deleted_objects(self):
+        """Test that refresh finds changes through updated_at."""
+        self.storage.new(make(Place, "p2", city_id="c2", name="Chocolate Factory"))
+        self.assertEqual(self.renderer.refresh(), ["cities/c2.html"])
+        self.storage.delete_by_id("City", "c2")
+        self.assertEqual(self.renderer.refresh(), ["index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "cities/c2.html")))
+        self.assertNotIn("Lekki", self.read("index.html"))
+
+        self.storage.new(make(State, "s2", name="Kampala"))
+        self.assertEqual(self.renderer.update(["State.s2"]), ["index.html"])
+        self.assertIn("Kampala", self.read("index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
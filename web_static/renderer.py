@@ -0,0 +1,443 @@
+#!/usr/bin/python3
+"""
+Renders the listings pages of web_static from the objects in storage.
+
+Pages:
+    index.html              every State with its Cities, and the Amenities
+    cities/<city_id>.html   the Places of a City, as in 8-index.html
+
+The renderer remembers which objects each page was built from, so
+update() re-renders only the pages a change can affect. Pages are
+written atomically, and full rebuilds are spread over a process pool.
+
+Usage:
+    python3 -m web_static.renderer -o web_static/listings
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from string import Template
+
+PARALLEL_MIN_PAGES = 64
+
+PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+
+<head>
+    <meta charset="UTF-8">
+    <meta http-equiv="X-UA-Compatible" content="IE=edge">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="stylesheet" href="${root}styles/reset.css">
+    <link rel="stylesheet" href="${root}styles/styles.css">
+    <link rel="shortcut icon" href="/AirBnB_clone/web_static/images/icon.png" type="image/x-icon">
+    <title>${title}</title>
+</head>
+
+<body>
+    <header class="site-header">
+        AirBnB Clone
+    </header>
+
+    <main class="content">
+        <section class="filters">
+            <div class="filter-group">
+                <h3>States</h3>
+                <ul class="filter-list">
+${states}
+                </ul>
+            </div>
+            <div class="filter-group">
+                <h3>Amenities</h3>
+                <ul class="filter-list">
+${amenities}
+                </ul>
+            </div>
+        </section>
+
+        <section class="places">
+            <h1>${heading}</h1>
+            <div class="places-container">
+${body}
+            </div>
+        </section>
+    </main>
+
+    <footer class="site-footer">
+        Best School
+    </footer>
+</body>
+
+</html>
+""")
+
+ITEM = Template("""                    <li>${text}</li>""")
+
+CITY_LINK = Template("""                <article>
+                    <h2><a href="cities/${id}.html">${name}</a></h2>
+                    <div class="place-details">${state}</div>
+                </article>""")
+
+PLACE = Template("""                <article>
+                    <h2>${name}</h2>
+                    <div class="place-details">
+                        <div class="price">Price: $$${price_by_night} per night</div>
+                        <div class="guests">Max Guests: ${max_guest}</div>
+                        <div class="bedrooms">Bedrooms: ${number_rooms}</div>
+                        <div class="bathrooms">Bathrooms: ${number_bathrooms}</div>
+                        <div class="owner">Owner: ${owner}</div>
+                        <div class="description">
+                            ${description}
+                        </div>
+                        <ul class="amenities">
+${amenities}
+                        </ul>
+                        <ul class="reviews">
+${reviews}
+                        </ul>
+                    </div>
+                </article>""")
+
+REVIEW = Template("""                            <li>${author}: ${text}</li>""")
+
+INDEX_PAGE = "index.html"
+LISTED_CLASSES = ("State", "City", "Amenity")
+
+
+def city_page(city_id):
+    """
+    Returns the path of a City's page, relative to the output directory.
+    """
+    return f"cities/{city_id}.html"
+
+
+def _full_name(user):
+    """
+    Returns the display name of a User, or an empty string.
+    """
+    if user is None:
+        return ""
+    name = f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}"
+    return escape(name.strip())
+
+
+def render_page(page, context):
+    """
+    Renders a page context into HTML.
+    """
+    if page == INDEX_PAGE:
+        body = "\n".join(CITY_LINK.substitute(city) for city in context["cities"])
+        root = ""
+    else:
+        body = "\n".join(
+            PLACE.substitute(
+                place,
+                amenities="\n".join(ITEM.substitute(text=name)
+                                    for name in place["amenities"]),
+                reviews="\n".join(REVIEW.substitute(review)
+                                  for review in place["reviews"]))
+            for place in context["places"])
+        root = "../"
+    return PAGE.substitute(
+        root=root,
+        title=context["title"],
+        heading=context["heading"],
+        states="\n".join(ITEM.substitute(text=name) for name in context["states"]),
+        amenities="\n".join(ITEM.substitute(text=name)
+                            for name in context["amenities"]),
+        body=body)
+
+
+def write_page(output_dir, page, context):
+    """
+    Renders a page and atomically writes it under output_dir.
+    """
+    path = os.path.join(output_dir, page)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render_page(page, context))
+    os.replace(tmp_path, path)
+    return page
+
+
+def _write_job(job):
+    """
+    Process pool entry point for write_page.
+    """
+    return write_page(*job)
+
+
+class Renderer:
+    """
+    Builds listings pages from storage and keeps them up to date.
+    """
+
+    def __init__(self, storage, output_dir, workers=None):
+        """
+        Initializes the renderer.
+
+        Args:
+            storage (FileStorage): Source of the objects.
+            output_dir (str): Directory the pages are written to.
+            workers (int): Processes used for full rebuilds.
+        """
+        self.storage = storage
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.__deps = {}
+        self.__page_keys = {}
+        self.__places_by_city = {}
+        self.__reviews_by_place = {}
+        self.__parents = {}
+        self.__listed = set()
+        self.__seen = {}
+
+    def __get(self, class_name, obj_id):
+        """
+        Returns the stored object of class_name with obj_id, or None.
+        """
+        return self.storage.all().get(f"{class_name}.{obj_id}")
+
+    def __depend(self, page, *keys):
+        """
+        Records that page was built from the objects under keys.
+        """
+        for key in keys:
+            self.__deps.setdefault(key, set()).add(page)
+        self.__page_keys.setdefault(page, set()).update(keys)
+
+    def __forget(self, page):
+        """
+        Drops the dependencies recorded for page before it is re-rendered.
+        """
+        for key in self.__page_keys.pop(page, ()):
+            pages = self.__deps.get(key)
+            if pages is not None:
+                pages.discard(page)
+                if not pages:
+                    del self.__deps[key]
+
+    def __index_context(self):
+        """
+        Builds the context of the index page.
+        """
+        states, cities, amenities = [], [], []
+        groups = {"State": states, "City": cities, "Amenity": amenities}
+        objects = self.storage.all()
+        for key in self.__listed:
+            obj = objects.get(key)
+            if obj is not None:
+                groups[key.split(".", 1)[0]].append(obj)
+                self.__depend(INDEX_PAGE, key)
+        state_names = {state.id: state.name for state in states}
+        return {
+            "title": "AirBnB Clone",
+            "heading": "Cities",
+            "states": sorted(escape(name) for name in state_names.values()),
+            "amenities": sorted(escape(amenity.name) for amenity in amenities),
+            "cities": [{"id": escape(city.id), "name": escape(city.name),
+                        "state": escape(state_names.get(city.state_id, ""))}
+                       for city in sorted(cities, key=lambda city: city.name)],
+        }
+
+    def __city_context(self, city):
+        """
+        Builds the context of a City's page.
+        """
+        page = city_page(city.id)
+        state = self.__get("State", city.state_id)
+        self.__depend(page, f"City.{city.id}", f"State.{city.state_id}")
+        places = []
+        amenity_names = set()
+        for place_id in sorted(self.__places_by_city.get(city.id, ())):
+            place = self.__get("Place", place_id)
+            if place is None:
+                continue
+            owner = self.__get("User", place.user_id)
+            self.__depend(page, f"Place.{place.id}", f"User.{place.user_id}")
+            amenities = []
+            for amenity_id in place.amenity_ids:
+                amenity = self.__get("Amenity", amenity_id)
+                self.__depend(page, f"Amenity.{amenity_id}")
+                if amenity is not None:
+                    amenities.append(escape(amenity.name))
+            amenity_names.update(amenities)
+            reviews = []
+            for review_id in sorted(self.__reviews_by_place.get(place.id, ())):
+                review = self.__get("Review", review_id)
+                if review is None:
+                    continue
+                self.__depend(page, f"Review.{review.id}", f"User.{review.user_id}")
+                reviews.append({"author": _full_name(self.__get("User", review.user_id)),
+                                "text": escape(review.text)})
+            places.append({
+                "name": escape(place.name),
+                "price_by_night": place.price_by_night,
+                "max_guest": place.max_guest,
+                "number_rooms": place.number_rooms,
+                "number_bathrooms": place.number_bathrooms,
+                "owner": _full_name(owner),
+                "description": escape(place.description),
+                "amenities": amenities,
+                "reviews": reviews,
+            })
+        return {
+            "title": f"AirBnB Clone - {escape(city.name)}",
+            "heading": f"Places in {escape(city.name)}",
+            "states": [escape(state.name)] if state else [],
+            "amenities": sorted(amenity_names),
+            "places": places,
+        }
+
+    def __context(self, page):
+        """
+        Builds the context of page, or returns None if it no longer exists.
+        """
+        if page == INDEX_PAGE:
+            return self.__index_context()
+        city = self.__get("City", page[len("cities/"):-len(".html")])
+        return self.__city_context(city) if city else None
+
+    def __group(self, key, obj):
+        """
+        Files a Place under its City or a Review under its Place, moving
+        or removing it if it was filed before, and keeps the keys of the
+        States, Cities and Amenities listed on the index page.
+        """
+        class_name, obj_id = key.split(".", 1)
+        if class_name in LISTED_CLASSES:
+            if obj is None:
+                self.__listed.discard(key)
+            else:
+                self.__listed.add(key)
+            return
+        if class_name == "Place":
+            groups, field = self.__places_by_city, "city_id"
+        elif class_name == "Review":
+            groups, field = self.__reviews_by_place, "place_id"
+        else:
+            return
+        previous = self.__parents.pop(key, None)
+        if previous is not None:
+            groups.get(previous, set()).discard(obj_id)
+        if obj is not None:
+            parent = getattr(obj, field)
+            groups.setdefault(parent, set()).add(obj_id)
+            self.__parents[key] = parent
+
+    def __affected(self, key, obj):
+        """
+        Returns the pages a change to the object under key can affect.
+        """
+        pages = set(self.__deps.get(key, ()))
+        if obj is None:
+            return pages
+        class_name = key.split(".", 1)[0]
+        if class_name in ("State", "City", "Amenity"):
+            pages.add(INDEX_PAGE)
+        if class_name == "City":
+            pages.add(city_page(obj.id))
+        elif class_name == "Place":
+            pages.add(city_page(obj.city_id))
+        elif class_name == "Review":
+            place = self.__get("Place", obj.place_id)
+            if place is not None:
+                pages.add(city_page(place.city_id))
+        return pages
+
+    def __render(self, pages):
+        """
+        Re-renders pages, removing those whose City is gone.
+        """
+        for page in pages:
+            self.__forget(page)
+        jobs = []
+        for page in sorted(pages):
+            context = self.__context(page)
+            if context is None:
+                path = os.path.join(self.output_dir, page)
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                jobs.append((self.output_dir, page, context))
+        if self.workers > 1 and len(jobs) >= PARALLEL_MIN_PAGES:
+            with ProcessPoolExecutor(self.workers) as pool:
+                return list(pool.map(_write_job, jobs, chunksize=16))
+        return [write_page(*job) for job in jobs]
+
+    def build(self):
+        """
+        Renders every page from scratch.
+
+        Returns:
+            list: The pages written.
+        """
+        self.__deps = {}
+        self.__page_keys = {}
+        self.__places_by_city = {}
+        self.__reviews_by_place = {}
+        self.__parents = {}
+        self.__listed = set()
+        self.__seen = {}
+        pages = {INDEX_PAGE}
+        for key, obj in self.storage.all().items():
+            self.__seen[key] = obj.updated_at
+            self.__group(key, obj)
+            if key.startswith("City."):
+                pages.add(city_page(obj.id))
+        return self.__render(pages)
+
+    def update(self, keys):
+        """
+        Re-renders only the pages affected by changes to the objects
+        under keys (Class.id strings), including created and deleted ones.
+
+        Returns:
+            list: The pages written.
+        """
+        objects = self.storage.all()
+        pages = set()
+        for key in keys:
+            obj = objects.get(key)
+            self.__group(key, obj)
+            if obj is None:
+                self.__seen.pop(key, None)
+            else:
+                self.__seen[key] = obj.updated_at
+            pages.update(self.__affected(key, obj))
+        return self.__render(pages)
+
+    def refresh(self):
+        """
+        Finds the objects created, updated or deleted since the last build
+        or update by comparing updated_at, and re-renders their pages.
+
+        Returns:
+            list: The pages written.
+        """
+        objects = self.storage.all()
+        changed = [key for key, obj in objects.items()
+                   if self.__seen.get(key) != obj.updated_at]
+        changed.extend(key for key in self.__seen if key not in objects)
+        return self.update(changed)
+
+
+def main():
+    """
+    Command-line entry point: reloads storage and renders every page.
+    """
+    from models import storage
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", default="web_static/listings")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    storage.reload()
+    pages = Renderer(storage, args.output, args.workers).build()
+    print(f"rendered {len(pages)} pages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()